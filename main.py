@@ -1,8 +1,22 @@
 from utils import build_fusion_graph
+from utils._json_io import dumps as _dumps
+from utils import _cache
 import utils.eventic_graph_builder as evg
-import json
+import argparse
+import logging
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-cache", action="store_true", help="캐시를 모두 끄고 매번 API를 호출")
+    parser.add_argument("--quiet", action="store_true", help="그래프 구축 추적 로그(DEBUG) 끄기")
+    args = parser.parse_args()
+
+    # 추적 로그는 utils.* 로거에서만 DEBUG (requests/httpx 등 외부 라이브러리 로그는 WARNING 유지)
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(message)s")
+    logging.getLogger("utils").setLevel(logging.INFO if args.quiet else logging.DEBUG)
+    if args.no_cache:
+        _cache.USE_CACHE = False   # 모든 캐시 계층이 이 스위치를 읽음 (결과 정합성 검증용)
+
     # 예시 문서 (GDPR 제17조 삭제권 + 처리자 의무 + 감독기관 권한)
     document = (
         "According to GDPR Article 17, the Controller must delete personal data "
@@ -14,7 +28,7 @@ def main():
     # 1) 문서 → Eventic Graph
     eventic = evg.build_eventic_graph(document)
     print("\n=== Eventic Graph ===")
-    print(json.dumps(eventic, ensure_ascii=False, indent=2))
+    print(_dumps(eventic))
 
     # 2) Eventic Graph → Fusion Graph
     fusion = build_fusion_graph(
@@ -26,7 +40,7 @@ def main():
         include_tdg_edges=True
     )
     print("\n=== Fusion Graph ===")
-    print(json.dumps(fusion, ensure_ascii=False, indent=2))
+    print(_dumps(fusion))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,4 @@
+"""공용 캐시 설정: 모든 캐시 계층(lru_cache/LRU/디스크/HTTP 캐시)이 이 값을 호출 시점에 읽는다."""
+
+USE_CACHE = True      # False면 모든 캐시 우회 (정합성 검증용; main.py --no-cache)
+MEMO_MAXSIZE = 4096   # 프로세스 내 lru_cache/LRU 크기
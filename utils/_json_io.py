@@ -0,0 +1,15 @@
+"""공용 JSON 헬퍼: orjson이 있으면 사용하고, 없으면 표준 json으로 대체."""
+import json
+
+try:
+    import orjson  # 선택 의존성: 설치 시 빠른 JSON 파싱/직렬화
+except ImportError:
+    orjson = None
+
+loads = orjson.loads if orjson is not None else json.loads
+
+def dumps(obj) -> str:
+    """사람이 읽는 출력용 JSON (들여쓰기 2, UTF-8 그대로)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2)
@@ -0,0 +1,33 @@
+"""공용 OpenAI 클라이언트: 필터/TDG/eventic 모듈이 하나의 커넥션 풀을 공유."""
+from __future__ import annotations
+import importlib.util
+import threading
+from typing import Optional
+import httpx
+from openai import OpenAI
+
+OPENAI_TIMEOUT = 60            # 요청 타임아웃(초)
+OPENAI_MAX_CONNECTIONS = 32    # keep-alive 커넥션 풀 크기 (확장 스레드 수보다 넉넉히)
+OPENAI_MAX_RETRIES = 3         # 일시적 오류(연결/429/5xx) 재시도 횟수 — SDK 내장 백오프 사용
+
+# 첫 호출 시 생성 → import 시점에 API 키가 없어도 안전
+# keep-alive 커넥션 풀로 호출 간 TCP/TLS 재사용, HTTP/2는 h2 패키지가 있을 때만.
+# 확장 스레드에서 동시에 불릴 수 있으므로 생성은 락으로 보호.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_CLIENT: Optional[OpenAI] = None
+_CLIENT_LOCK = threading.Lock()
+
+def get_client() -> OpenAI:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = OpenAI(max_retries=OPENAI_MAX_RETRIES, http_client=httpx.Client(
+                    http2=_HTTP2,
+                    timeout=OPENAI_TIMEOUT,
+                    limits=httpx.Limits(
+                        max_connections=OPENAI_MAX_CONNECTIONS,
+                        max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+                    ),
+                ))
+    return _CLIENT
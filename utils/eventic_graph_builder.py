@@ -1,12 +1,21 @@
 # utils/eventic_graph_builder.py
 from __future__ import annotations
-import json
+import hashlib
+import logging
 import re
-from typing import Dict, List
-from openai import OpenAI
+from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
 
+from utils._json_io import loads as _loads, dumps as _dumps
+from utils import _cache
+from utils._openai_client import get_client as _get_client
+
+try:
+    import diskcache  # 선택 의존성: 설치 시 GPT 결과 디스크 캐시
+except ImportError:
+    diskcache = None
+
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -14,7 +23,20 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 # 기본 설정
 # ------------------------------
 DEFAULT_MODEL = "gpt-4o"
-VERBOSE = True
+CACHE_DIR = ".cache/evg"   # 문서별 추출 결과 캐시 (diskcache 설치 시)
+
+log = logging.getLogger(__name__)   # 추적 로그는 DEBUG; 레벨/핸들러는 실행 진입점에서 설정
+
+# 추출 결과 디스크 캐시 (첫 사용 시 생성; diskcache 미설치 시 None → 캐시 없이 동작)
+_CACHE = None
+
+def _get_cache():
+    global _CACHE
+    if not _cache.USE_CACHE:
+        return None
+    if _CACHE is None and diskcache is not None:
+        _CACHE = diskcache.Cache(CACHE_DIR)
+    return _CACHE
 
 # ------------------------------
 # System Prompt (안내만 함. 필터/정규화 없음)
@@ -26,33 +48,33 @@ _SYSTEM_PROMPT = (
     "- Agent: the actor (e.g., organization, person, authority, controller, processor, etc.)\n"
     "- Deontic: the modality (e.g., must, must_not, should, should_not, may, can, will, shall, etc.)\n"
     "- Action: a short phrase describing the regulated behavior\n\n"
-    "Output must be ONLY a valid JSON array of objects, each with keys:\n"
-    "[\"Agent\", \"Deontic\", \"Action\"].\n"
+    "Output must be ONLY a valid JSON object of the form {\"events\": [...]},\n"
+    "where each element of \"events\" is an object with keys [\"Agent\", \"Deontic\", \"Action\"].\n"
     "No extra text. No explanations. Keep actions concise.\n\n"
     "### Examples ###\n\n"
     # 유지할 좋은 예시 1
     "Input: \"To this end, subject to any confidentiality agreements Solectron may have, Solectron will both inform and provide a commercially reasonable opportunity for acquisition of new and emerging Solectron and industry technology.\"\n"
     "Output:\n"
-    "[\n"
+    "{\"events\": [\n"
     "  {\"Agent\": \"Solectron\", \"Deontic\": \"will\", \"Action\": \"inform acquisition of new and emerging Solectron and industry technology subject to confidentiality agreements Solectron may have\"},\n"
-    "  {\"Agent\": \"Solectron\", \"Deontic\": \"will\", \"Action\": \"provide opportunity acquisition of new and emerging Solectron and industry technology subject to confidentiality agreements Solectron may have\"},\n"
-    "]\n\n"
+    "  {\"Agent\": \"Solectron\", \"Deontic\": \"will\", \"Action\": \"provide opportunity acquisition of new and emerging Solectron and industry technology subject to confidentiality agreements Solectron may have\"}\n"
+    "]}\n\n"
     # 유지할 좋은 예시 2
     "Input: \"Company can choose not to inform the customers about data usage.\"\n"
     "Output:\n"
-    "[\n"
+    "{\"events\": [\n"
     "  {\"Agent\": \"Company\", \"Deontic\": \"can\", \"Action\": \"choose not to inform the customers about data usage\"}\n"
-    "]\n\n"
+    "]}\n\n"
     # 새롭게 추가하는 multi-event 예시
     "Input: \"According to GDPR, Tesla must delete personal data when consent is withdrawn. "
     "The Processor must_not share personal data with unauthorized parties. "
     "Supervisory Authorities may impose fines on Controllers who fail to comply.\"\n"
     "Output:\n"
-    "[\n"
+    "{\"events\": [\n"
     "  {\"Agent\": \"Tesla\", \"Deontic\": \"must\", \"Action\": \"delete personal data when consent is withdrawn\"},\n"
     "  {\"Agent\": \"Processor\", \"Deontic\": \"must_not\", \"Action\": \"share personal data with unauthorized parties\"},\n"
     "  {\"Agent\": \"Authority\", \"Deontic\": \"may\", \"Action\": \"impose fines on Controllers who fail to comply\"}\n"
-    "]\n\n"
+    "]}\n\n"
     "### End of Examples ###"
     "Extract regulatory events from the following document text."
 )
@@ -62,6 +84,10 @@ _USER_TEMPLATE = "Document:\n{doc}\n\nReturn JSON Eventic Graph:"
 # ------------------------------
 # 파싱 유틸 (코드펜스/느슨한 JSON 모두 지원)
 # ------------------------------
+_JSON_FENCE_JSON = re.compile(r"```json\s*(\[.*?\]|\{.*?\})\s*```", re.S)
+_JSON_FENCE = re.compile(r"```\s*(\[.*?\]|\{.*?\})\s*```", re.S)
+_JSON_ARRAY = re.compile(r"(\[\s*\{.*?\}\s*\])", re.S)
+
 def _extract_json_text(raw: str) -> str:
     """
     모델 응답에서 JSON 문자열만 뽑아낸다.
@@ -71,45 +97,49 @@ def _extract_json_text(raw: str) -> str:
     if not isinstance(raw, str):
         return ""
     # ```json ... ```
-    m = re.search(r"```json\s*(\[.*?\]|\{.*?\})\s*```", raw, flags=re.S)
+    m = _JSON_FENCE_JSON.search(raw)
     if m:
         return m.group(1).strip()
     # 일반 ``` ... ```
-    m = re.search(r"```\s*(\[.*?\]|\{.*?\})\s*```", raw, flags=re.S)
+    m = _JSON_FENCE.search(raw)
     if m:
         return m.group(1).strip()
     # 펜스 없으면 원문
     return raw.strip()
 
-def _coerce_event_list(text: str) -> List[Dict[str, str]]:
+def _coerce_event_list(text: str) -> Optional[List[Dict[str, str]]]:
     """
     안전하게 JSON을 파싱해 Event 리스트로 변환.
     - 배열 또는 {"events": [...]} 형태 모두 허용
     - 키는 Agent/Deontic/Action이 모두 있는 항목만 유지
     - Deontic/Agent의 값은 어떤 것이든 그대로 둔다(필터/정규화 없음)
+    - JSON 파싱 실패/형식 불일치 또는 문자열이 아닌 입력(예: 거절 응답의 content=None)은 None
+      (유효한 JSON인데 이벤트가 없으면 빈 리스트 → 호출부에서 구분해 캐시 여부 결정)
     """
+    if not isinstance(text, str):
+        return None
     try:
-        data = json.loads(text)
+        data = _loads(text)
     except Exception:
         # 가장 바깥 대괄호 구간만 재시도
-        m = re.search(r"(\[\s*\{.*?\}\s*\])", text, flags=re.S)
+        m = _JSON_ARRAY.search(text)
         if m:
             try:
-                data = json.loads(m.group(1))
+                data = _loads(m.group(1))
             except Exception:
-                return []
+                return None
         else:
-            return []
+            return None
 
     # 배열 또는 {"events": [...]} 지원
     if isinstance(data, dict):
         events = data.get("events")
         if not isinstance(events, list):
-            return []
+            return None
     elif isinstance(data, list):
         events = data
     else:
-        return []
+        return None
 
     out: List[Dict[str, str]] = []
     for ev in events:
@@ -133,14 +163,22 @@ def build_eventic_graph(
 ) -> List[Dict[str, str]]:
     """
     Build an Eventic Graph from a document text.
-    - 모델 출력 형식만 강제(배열의 객체에 Agent/Deontic/Action 키)
+    - 모델 출력 형식만 강제(JSON 모드, {"events": [...]} 객체에 Agent/Deontic/Action 키)
     - Deontic/Agent 값에 대한 필터/정규화 없음
+    - (model, 프롬프트, 문서) 해시가 같으면 디스크 캐시 결과를 그대로 반환
     """
-    client = OpenAI()
     user_msg = _USER_TEMPLATE.format(doc=document_text.strip())
+    cache = _get_cache()
+    key = hashlib.sha256((model + _SYSTEM_PROMPT + user_msg).encode("utf-8")).hexdigest()
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            log.debug("Eventic cache hit: %s", key[:12])
+            return cached
+
+    client = _get_client()
 
-    if VERBOSE:
-        print("[VERBOSE] Sending request to OpenAI API...")
+    log.debug("Sending request to OpenAI API...")
 
     resp = client.chat.completions.create(
         model=model,
@@ -149,23 +187,32 @@ def build_eventic_graph(
             {"role": "user", "content": user_msg},
         ],
         max_tokens=1200,
+        response_format={"type": "json_object"},  # {"events": [...]} 순수 JSON 보장
     )
 
     raw = resp.choices[0].message.content
-    if VERBOSE:
-        print("[VERBOSE] Raw response:", raw)
-
-    json_text = _extract_json_text(raw)
-    if VERBOSE and json_text != raw:
-        print("[VERBOSE] Extracted JSON block:\n", json_text)
-
-    events = _coerce_event_list(json_text)
+    log.debug("Raw response: %s", raw)
+
+    events = _coerce_event_list(raw)
+    if not events:
+        # 폴백: JSON 모드가 지켜지지 않은 응답(코드펜스 등)만 regex로 복구
+        json_text = _extract_json_text(raw)
+        if json_text != raw:
+            log.debug("Extracted JSON block:\n%s", json_text)
+            events = _coerce_event_list(json_text)
+
+    if events is None:
+        # 파싱 실패만 캐시하지 않음 (이벤트 없는 정상 응답 {"events": []}은 캐시해 재호출 방지)
+        return []
+    if cache is not None:
+        cache.set(key, events)
     return events
 
 # ------------------------------
 # 실행 예시
 # ------------------------------
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="[DBG] %(message)s")
     sample_doc = (
         "According to GDPR Article 17, the Controller must delete personal data "
         "when the Data Subject withdraws consent. "
@@ -174,6 +221,6 @@ if __name__ == "__main__":
         "Solectron will provide a commercially reasonable opportunity for acquisition."
     )
     graph = build_eventic_graph(sample_doc, model=DEFAULT_MODEL)
-    print(json.dumps(graph, ensure_ascii=False, indent=2))
+    print(_dumps(graph))
 
 
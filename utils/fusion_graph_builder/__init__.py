@@ -1,14 +1,25 @@
 # utils/fusion_graph_builder/__init__.py
 from __future__ import annotations
-import json
+import functools
+import hashlib
+import logging
 import re
-from typing import Dict, List, Iterable, Optional, Tuple, Set
-from openai import OpenAI
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, FrozenSet, List, Iterable, NamedTuple, Optional, Tuple, Set
+
+try:
+    import diskcache  # 선택 의존성: 설치 시 GPT 결과 디스크 캐시
+except ImportError:
+    diskcache = None
 
 # 내부 모듈
 from .concept_graph_search import fetch_conceptnet_triples
-from .entity_graph_search import fetch_dbpedia_triples
-from .term_definition_graph import build_term_definition_triples
+from .entity_graph_search import fetch_dbpedia_triples_batch
+from .term_definition_graph import build_term_definition_triples_batch
+from .._json_io import loads as _loads
+from .. import _cache
+from .._openai_client import get_client as _get_client
+from ._text import _norm, _norm_lower
 
 # ==============================
 # 하이퍼 파라미터 (전역 설정)
@@ -21,6 +32,11 @@ CONCEPT_MAX: Optional[int] = 3
 ENTITY_MAX: Optional[int] = 3
 ROUNDS: int = 2
 
+# GPT 필터 (라운드당 1회 호출; 후보가 상한을 넘을 때만 분할)
+FILTER_MAX_CANDIDATES: int = 200
+FILTER_TOKENS_PER_CANDIDATE: int = 16   # 후보 수에 비례한 max_tokens
+FILTER_SKIP_THRESHOLD: int = 3          # 후보가 이 이하이면 필터 호출 없이 전부 확장
+
 # TDG 처리
 INCLUDE_TDG_EDGES: bool = False   # TDG 엣지를 최종 그래프에 포함할지
 
@@ -29,20 +45,61 @@ USE_CONCEPT_GRAPH: bool = True
 USE_ENTITY_GRAPH: bool = True
 USE_TERM_DEFINITION_GRAPH: bool = True
 
-# 로깅
-VERBOSE: bool = True
+# 병렬 확장 (CG/EG/TDG 네트워크 호출 동시 실행)
+MAX_WORKERS: int = 10
+
+# GPT 필터 결과 디스크 캐시 경로 (diskcache 설치 시)
+FILTER_CACHE_DIR: str = ".cache/filter"
+
+# 라운드 확장에서 공유하는 스레드 풀
+EXPANDER_POOL = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fusion-expand")
 
 
 # ==============================
 # 유틸
 # ==============================
-def _norm(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+log = logging.getLogger(__name__)   # 추적 로그는 DEBUG; 레벨/핸들러는 실행 진입점(main.py)에서 설정
+
+_JSON_FENCE_OBJ = re.compile(r"```json\s*(\{.*?\})\s*```", re.S)
+
+class _Edge(NamedTuple):
+    """
+    내부 엣지 표현. 생성 시(_make_edge) 한 번만 정규화하고 소문자 키도 함께 보관한다.
+    dict 변환은 build_fusion_graph 반환 시점에 한 번만 수행.
+    """
+    src: str
+    rel: str
+    tgt: str
+    src_lc: str
+    tgt_lc: str
+    graph: str
+
+def _make_edge(src: str, rel: str, tgt: str, graph: str) -> Optional[_Edge]:
+    """정규화된 _Edge 생성. source/relation/target 중 하나라도 비면 None."""
+    src = _norm(src); rel = _norm(rel); tgt = _norm(tgt)
+    if not src or not rel or not tgt:
+        return None
+    return _Edge(src, rel, tgt, src.lower(), tgt.lower(), graph)
+
+# 큐 항목: (정규화 표기, 소문자 키) — 라운드마다 lower() 재계산하지 않도록 함께 보관
+_Agent = Tuple[str, str]
+
+def _edge_to_dict(e: _Edge) -> Dict[str, str]:
+    return {"source": e.src, "relation": e.rel, "target": e.tgt, "source_graph": e.graph}
 
 def _is_agent_key(k: str) -> bool:
     k_l = (k or "").lower()
     return k_l == "agent" or k_l.startswith("agent")
 
+def _dedup_agents(agents: Iterable[str]) -> List[str]:
+    """정규화(공백/대소문자) 기준 중복 제거. 첫 등장 표기를 유지하고 빈 값은 버린다."""
+    uniq: Dict[str, str] = {}
+    for a in agents:
+        a = _norm(a)
+        if a:
+            uniq.setdefault(a.lower(), a)
+    return list(uniq.values())
+
 def _extract_agents_from_eventic(eventic_edges: List[Dict[str, str]]) -> List[str]:
     agents: List[str] = []
     for edge in eventic_edges:
@@ -52,53 +109,60 @@ def _extract_agents_from_eventic(eventic_edges: List[Dict[str, str]]) -> List[st
                 cand = v
                 break
         if cand:
-            agents.append(_norm(str(cand)))
-    uniq, seen = [], set()
-    for a in agents:
-        if a and a.lower() not in seen:
-            uniq.append(a); seen.add(a.lower())
-    return uniq
+            agents.append(str(cand))
+    return _dedup_agents(agents)
 
-def _eventic_to_triples(eventic_edges: List[Dict[str, str]]) -> List[Dict[str, str]]:
+def _eventic_to_triples(eventic_edges: List[Dict[str, str]]) -> List[_Edge]:
     """
-    {Agent, Deontic, Action} → (source=Agent, relation=Deontic, target=Action)
+    {Agent, Deontic, Action} → (source=Agent, relation=Deontic, target=Action, "eventic")
+    중복 행은 여기서 제거 (이후 확장 엣지는 build_fusion_graph 의 seen_edges 로 append 시점에 제거).
     """
-    out: List[Dict[str, str]] = []
+    out: List[_Edge] = []
     for row in eventic_edges:
         agent = row.get("Agent") or row.get("agent") or row.get("Agent1") or row.get("agent1") or ""
         deon  = row.get("Deontic") or row.get("deontic") or ""
         act   = row.get("Action") or row.get("action") or ""
         if agent and deon and act:
-            out.append({
-                "source": _norm(str(agent)),
-                "relation": _norm(str(deon)),
-                "target": _norm(str(act)),
-                "source_graph": "eventic",
-            })
-    return out
+            e = _make_edge(str(agent), str(deon), str(act), "eventic")
+            if e:
+                out.append(e)
+    return _dedup_edges(out)
+
+def _edge_key(e: _Edge) -> Tuple[str, str, str, str]:
+    """중복 판정 키: _make_edge 에서 미리 계산한 소문자 source/target 사용."""
+    return (e.src_lc, e.rel, e.tgt_lc, e.graph)
 
-def _dedup_edges(edges: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+def _dedup_edges(edges: Iterable[_Edge]) -> List[_Edge]:
+    """_make_edge 에서 미리 계산한 소문자 키로 중복 제거 (정규화 재수행 없음)."""
     seen: Set[Tuple[str, str, str, str]] = set()
-    out: List[Dict[str, str]] = []
+    out: List[_Edge] = []
     for e in edges:
-        src = _norm(e.get("source", "")); rel = _norm(e.get("relation", "")); tgt = _norm(e.get("target", ""))
-        g   = e.get("source_graph", "")
-        sig = (src.lower(), rel, tgt.lower(), g)
-        if not src or not rel or not tgt: continue
+        sig = _edge_key(e)
         if sig in seen: continue
-        out.append({"source": src, "relation": rel, "target": tgt, "source_graph": g})
+        out.append(e)
         seen.add(sig)
     return out
 
 def _print_edges(title: str, triples: List[Dict[str, str]], graph_tag: str, *, enqueued: bool):
-    """VERBOSE 모드에서 그래프 확장 결과를 보기 좋게 출력."""
-    if not VERBOSE:
+    """DEBUG 로그가 켜져 있을 때 그래프 확장 결과를 보기 좋게 출력."""
+    if not log.isEnabledFor(logging.DEBUG):
         return
-    print(f"[VERBOSE] {title} → {len(triples)} edge(s)")
+    log.debug("%s → %d edge(s)", title, len(triples))
     for t in triples:
-        src = _norm(t.get("source", "")); rel = _norm(t.get("relation", "")); tgt = _norm(t.get("target", ""))
-        print(f"  - [{graph_tag}] {src} -{rel}-> {tgt}")
-    print(f"[VERBOSE]   ⤷ targets enqueued: {len(triples) if enqueued else 0}")
+        log.debug("  - [%s] %s -%s-> %s", graph_tag, t.get("source", ""), t.get("relation", ""), t.get("target", ""))
+    log.debug("  ⤷ targets enqueued: %d", len(triples) if enqueued else 0)
+
+
+# GPT 필터 디스크 캐시 (첫 사용 시 생성; diskcache 미설치 시 None)
+_FILTER_CACHE = None
+
+def _get_filter_cache():
+    global _FILTER_CACHE
+    if not _cache.USE_CACHE:
+        return None
+    if _FILTER_CACHE is None and diskcache is not None:
+        _FILTER_CACHE = diskcache.Cache(FILTER_CACHE_DIR)
+    return _FILTER_CACHE
 
 
 # ==============================
@@ -136,44 +200,84 @@ _SYSTEM_FILTER = (
 _USER_FILTER_TEMPLATE = "Candidates:\n{items}\n\nReturn:\n{{\n  \"keep\": [\"term1\", \"term2\", \"...\"]\n}}\n"
 
 def _pick_hard_agents_via_gpt(cands: List[str], model: str = DEFAULT_MODEL) -> List[str]:
-    if not cands:
+    """
+    라운드 전체 후보를 한 번에 GPT 필터에 보낸다 (FILTER_MAX_CANDIDATES 초과 시에만 분할).
+    후보는 대소문자 무시로 중복 제거하고, 결과는 후보 집합 기준으로 memoize.
+    반환 순서는 입력 후보 순서를 따른다.
+    """
+    cand_map: Dict[str, str] = {}
+    for c in cands:
+        c = _norm(str(c))
+        k = c.lower()
+        if k and k not in cand_map:
+            cand_map[k] = c
+    if not cand_map:
         return []
-    client = OpenAI()
+    log.debug("[Filter] candidates=%s", list(cand_map.values()))
+    keep = _filter_keep_keys if _cache.USE_CACHE else _filter_keep_keys.__wrapped__
+    keep_keys = keep(frozenset(cand_map.values()), model)
+    out = [c for k, c in cand_map.items() if k in keep_keys]
+    log.debug("[Filter] kept=%s", out)
+    return out
+
+@functools.lru_cache(maxsize=1024)
+def _filter_keep_keys(cands: FrozenSet[str], model: str) -> FrozenSet[str]:
+    """
+    후보 집합 → GPT가 남긴 항목의 소문자 키 집합 (원본 후보와 교집합).
+    프로세스 내 lru_cache + 정렬된 후보 목록 해시 기준 디스크 캐시.
+    """
+    ordered = sorted(cands, key=str.lower)
+    cache = _get_filter_cache()
+    key = hashlib.sha256("\n".join([model, _SYSTEM_FILTER, *ordered]).encode("utf-8")).hexdigest()
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return frozenset(cached)
+
+    keep_keys: Set[str] = set()
+    for i in range(0, len(ordered), FILTER_MAX_CANDIDATES):
+        chunk = ordered[i:i + FILTER_MAX_CANDIDATES]
+        chunk_keys = {c.lower() for c in chunk}
+        for t in _call_filter_gpt(chunk, model):
+            k = _norm_lower(str(t))
+            if k in chunk_keys:
+                keep_keys.add(k)
+    if cache is not None:
+        cache.set(key, sorted(keep_keys))
+    return frozenset(keep_keys)
+
+def _call_filter_gpt(cands: List[str], model: str) -> List[str]:
+    client = _get_client()
     user_msg = _USER_FILTER_TEMPLATE.format(items="\n".join(f"- {c}" for c in cands))
-    if VERBOSE:
-        print(f"[VERBOSE] [Filter] candidates={cands}")
     resp = client.chat.completions.create(
         model=model,
         messages=[
             {"role": "system", "content": _SYSTEM_FILTER},
             {"role": "user", "content": user_msg}
         ],
-        max_tokens=400,
+        max_tokens=max(400, FILTER_TOKENS_PER_CANDIDATE * len(cands)),
+        response_format={"type": "json_object"},
     )
     text = resp.choices[0].message.content
     try:
-        data = json.loads(text)
+        data = _loads(text)
     except Exception:
-        m = re.search(r"```json\s*(\{.*?\})\s*```", text, flags=re.S)
-        data = json.loads(m.group(1)) if m else {"keep": []}
-    keep = data.get("keep") or []
-    if VERBOSE:
-        print(f"[VERBOSE] [Filter] kept={keep}")
-    # 원본 후보와 교집합으로 정제
-    cand_map = {c.lower(): c for c in cands}
-    out, seen = [], set()
-    for t in keep:
-        k = _norm(str(t)).lower()
-        if k in cand_map and k not in seen:
-            out.append(cand_map[k]); seen.add(k)
-    return out
+        # 폴백: JSON 모드가 지켜지지 않은 경우에만 코드펜스 추출
+        m = _JSON_FENCE_OBJ.search(text)
+        data = _loads(m.group(1)) if m else {"keep": []}
+    return data.get("keep") or []
 
 
 # ==============================
 # 1라운드 확장 (요구 로직 반영 + 상세 로그)
 # ==============================
+def _define_terms(agents: List[str], model: str) -> Dict[str, List[Dict[str, str]]]:
+    """TDG 정의를 라운드 단위 배치 호출로 생성 → {agent: [triple]} (정의 실패한 agent는 빈 리스트)."""
+    triples = build_term_definition_triples_batch(agents, model=model)
+    return {a: ([t] if t.get("target") else []) for a, t in zip(agents, triples)}
+
 def _expand_once(
-    agent_list: List[str],
+    agent_items: List[_Agent],
     *,
     model: str = DEFAULT_MODEL,
     concept_min_weight: float = CONCEPT_MIN_WEIGHT,
@@ -183,76 +287,122 @@ def _expand_once(
     use_concept_graph: bool = USE_CONCEPT_GRAPH,
     use_entity_graph: bool = USE_ENTITY_GRAPH,
     use_term_definition_graph: bool = USE_TERM_DEFINITION_GRAPH,
-) -> Tuple[List[Dict[str, str]], List[str]]:
+    visited: Optional[Set[str]] = None,
+    seen_edges: Optional[Set[Tuple[str, str, str, str]]] = None,
+) -> Tuple[List[_Edge], List[_Agent]]:
     """
-    1) agent_list → GPT 필터(고유명사/어려운 용어)
-    2) 필터된 리스트의 각 항목에 대해:
+    1) agent_items(표기, 소문자 키) → GPT 필터(고유명사/어려운 용어; FILTER_SKIP_THRESHOLD 이하면 생략)
+    2) 필터된 리스트의 각 항목에 대해 (EXPANDER_POOL에서 병렬 실행, 작업별 예외 격리):
        - ConceptNet 1-hop (사용 시; target enqueue)
-       - DBpedia 1-hop (사용 시; target enqueue)
-       - TDG 단일 정의 (사용 시; enqueue 안 함)
-    3) 결과 엣지와 다음 라운드 큐(next_queue) 반환
+       - DBpedia 1-hop (사용 시; target enqueue) — 라운드당 SPARQL 1회로 일괄 조회
+       - TDG 단일 정의 (사용 시; enqueue 안 함) — 라운드당 배치 프롬프트로 일괄 생성
+    3) 결과 엣지와 다음 라운드 큐(next_queue; 같은 (표기, 소문자 키) 형태) 반환 (병합은 hard_agents 순서 유지)
+    visited: 이미 확장했거나 큐에 넣은 agent의 소문자 집합. 전달되면 enqueue 시 제자리에서
+             갱신되어 라운드를 넘어 재확장을 막는다 (없으면 이번 라운드 agent만 제외).
+    seen_edges: 이미 그래프에 들어간 엣지 키(_edge_key) 집합. 전달되면 제자리에서 갱신되며
+                반환 엣지는 이 집합에 없던 것만 포함 (없으면 이번 라운드 내에서만 중복 제거).
     """
-    if VERBOSE:
-        print(f"\n[VERBOSE] === Expand start === agents={agent_list}")
-
-    edges: List[Dict[str, str]] = []
-    next_queue: List[str] = []
-
-    hard_agents = _pick_hard_agents_via_gpt(agent_list, model=model)
-    # 폴백: GPT가 아무 것도 고르지 않으면 전체 후보를 사용
-    if not hard_agents:
-        if VERBOSE:
-            print("[VERBOSE] [Filter] empty → fallback to all agents")
+    agent_list = [a for a, _ in agent_items]
+    log.debug("=== Expand start === agents=%s", agent_list)
+
+    if not agent_list:
+        return [], []
+    if not (use_concept_graph or use_entity_graph or use_term_definition_graph):
+        # ablation: 확장할 그래프가 없으면 필터 호출도 생략
+        log.debug("All graphs disabled → nothing to expand")
+        return [], []
+    if len(agent_list) <= FILTER_SKIP_THRESHOLD:
+        # 후보가 적으면 필터가 대부분 전부 남기므로 API 왕복 생략
+        log.debug("[Filter] %d candidate(s) ≤ %d → skip", len(agent_list), FILTER_SKIP_THRESHOLD)
         hard_agents = list(agent_list)
-
+    else:
+        try:
+            hard_agents = _pick_hard_agents_via_gpt(agent_list, model=model)
+        except Exception as e:
+            log.warning("[Filter] failed → using all agents: %r", e)
+            hard_agents = []
+        # 폴백: GPT가 아무 것도 고르지 않거나 호출이 실패하면 전체 후보를 사용
+        if not hard_agents:
+            log.debug("[Filter] empty → fallback to all agents")
+            hard_agents = list(agent_list)
+    # 동일 agent(대소문자/공백 변형)의 중복 조회 방지
+    hard_agents = _dedup_agents(hard_agents)
+
+    # ----- 네트워크 호출을 스레드 풀에 한꺼번에 제출 -----
+    # (agent, source) 단위 작업: CG는 agent별, EG/TDG는 라운드 단위 배치 1건씩
+    futures: Dict[Future, Tuple[Optional[str], str]] = {}
+    if use_entity_graph:
+        futures[EXPANDER_POOL.submit(
+            fetch_dbpedia_triples_batch, hard_agents, max_num=entity_max, exclude_wiki=True,
+        )] = (None, "entity")
+    if use_term_definition_graph:
+        futures[EXPANDER_POOL.submit(
+            _define_terms, hard_agents, model,
+        )] = (None, "term_definition")
     for agent in hard_agents:
-        if VERBOSE:
-            print(f"[VERBOSE] [Agent] '{agent}'")
-
-        # ----- Concept Graph -----
         if use_concept_graph:
-            if VERBOSE:
-                print(f"[VERBOSE] >>> Concept Graph: expand '{agent}' (min_w={concept_min_weight}, max={concept_max})")
-            c_tris = fetch_conceptnet_triples(agent, min_weight=concept_min_weight, max_num=concept_max) or []
-            for t in c_tris:
-                edges.append({**t, "source_graph": "concept"})
-                next_queue.append(t["target"])
-            _print_edges("Concept Graph result", c_tris, "concept", enqueued=True if c_tris else False)
-
-        # ----- Entity Graph -----
-        if use_entity_graph:
-            if VERBOSE:
-                print(f"[VERBOSE] >>> Entity Graph: expand '{agent}' (max={entity_max})")
-            e_tris = fetch_dbpedia_triples(agent, max_num=entity_max, exclude_wiki=True) or []
-            for t in e_tris:
-                edges.append({**t, "source_graph": "entity"})
-                next_queue.append(t["target"])
-            _print_edges("Entity Graph result", e_tris, "entity", enqueued=True if e_tris else False)
-
-        # ----- Term Definition Graph -----
-        if use_term_definition_graph:
-            if VERBOSE:
-                print(f"[VERBOSE] >>> Term Definition Graph: expand '{agent}' (single IsA)")
-            tdg_tris = build_term_definition_triples(agent, model=model) or []
-            if include_tdg_edges:
-                for t in tdg_tris:
-                    edges.append({**t, "source_graph": "term_definition"})
-            _print_edges("Term Definition Graph result", tdg_tris, "term_definition", enqueued=False)
-
-    # 다음 라운드 큐 구성(CQ/EG target만)
-    current_set = {a.lower() for a in agent_list}
-    uniq, seen = [], set()
-    for x in next_queue:
-        xn = _norm(x)
-        if not xn: continue
-        k = xn.lower()
-        if k in current_set or k in seen: continue
-        uniq.append(xn); seen.add(k)
-
-    edges = _dedup_edges(edges)
-    if VERBOSE:
-        print(f"[VERBOSE] === Expand end === added_edges={len(edges)}, next_queue={uniq}")
-    return edges, uniq
+            futures[EXPANDER_POOL.submit(
+                fetch_conceptnet_triples, agent, min_weight=concept_min_weight, max_num=concept_max,
+            )] = (agent, "concept")
+
+    # 작업별 예외 격리: 실패한 작업은 빈 결과로 취급하고 라운드는 계속 진행
+    results: Dict[Tuple[Optional[str], str], object] = {}
+    for fut in as_completed(futures):
+        try:
+            results[futures[fut]] = fut.result()
+        except Exception as e:
+            log.warning("[Task] %s failed → skipped: %r", futures[fut], e)
+    c_tris_by_agent: Dict[str, List[Dict[str, str]]] = {
+        a: r for (a, kind), r in results.items() if kind == "concept"
+    }
+    e_tris_by_agent: Dict[str, List[Dict[str, str]]] = results.get((None, "entity")) or {}
+    tdg_tris_by_agent: Dict[str, List[Dict[str, str]]] = results.get((None, "term_definition")) or {}
+
+    # ----- 결과 병합: hard_agents 순서대로 (실행 순서와 무관하게 결정적) -----
+    # 그래프별 루프를 agent당 한 루프로 합치고, 엣지 중복 제거와 다음 라운드 큐
+    # (CG/EG target만) 구성도 append 시점에 한 번에 처리
+    edges: List[_Edge] = []
+    next_queue: List[_Agent] = []
+    if seen_edges is None:
+        seen_edges = set()
+    queued: Set[str] = visited if visited is not None else set()
+    queued.update(lo for _, lo in agent_items)
+
+    # (태그, 표시명, agent별 결과, target enqueue 여부, 엣지 포함 여부) — 꺼진 그래프는 제외
+    graphs = [
+        (tag, title, by_agent, enqueue, keep)
+        for tag, title, by_agent, enqueue, keep, used in (
+            ("concept", "Concept Graph", c_tris_by_agent, True, True, use_concept_graph),
+            ("entity", "Entity Graph", e_tris_by_agent, True, True, use_entity_graph),
+            ("term_definition", "Term Definition Graph", tdg_tris_by_agent, False, include_tdg_edges,
+             use_term_definition_graph),
+        )
+        if used
+    ]
+    log.debug("Expand params → CG(min_w=%s, max=%s), EG(max=%s, batched), TDG(single IsA, batched)",
+              concept_min_weight, concept_max, entity_max)
+
+    for agent in hard_agents:
+        log.debug("[Agent] '%s'", agent)
+        for tag, title, by_agent, enqueue, keep in graphs:
+            tris = by_agent.get(agent) or []
+            if keep:
+                for t in tris:
+                    e = _make_edge(t["source"], t["relation"], t["target"], tag)
+                    if e is None:
+                        continue
+                    sig = _edge_key(e)
+                    if sig not in seen_edges:
+                        seen_edges.add(sig)
+                        edges.append(e)
+                    if enqueue and e.tgt_lc not in queued:
+                        queued.add(e.tgt_lc)
+                        next_queue.append((e.tgt, e.tgt_lc))
+            _print_edges(f"{title} result", tris, tag, enqueued=enqueue and bool(tris))
+
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("=== Expand end === added_edges=%d, next_queue=%s", len(edges), [a for a, _ in next_queue])
+    return edges, next_queue
 
 
 # ==============================
@@ -280,25 +430,31 @@ def build_fusion_graph(
       ]
     }
     """
-    if VERBOSE:
-        print("[VERBOSE] Build fusion graph start")
-        print(f"[VERBOSE] Graphs enabled → CG={use_concept_graph}, EG={use_entity_graph}, "
-              f"TDG={use_term_definition_graph} (include_tdg_edges={include_tdg_edges})")
-
-    final_edges: List[Dict[str, str]] = _eventic_to_triples(eventic_edges)
-    if VERBOSE:
-        print(f"[VERBOSE] Seed from eventic: {len(final_edges)} edges")
-    agents_queue: List[str] = _extract_agents_from_eventic(eventic_edges)
-    if VERBOSE:
-        print(f"[VERBOSE] Initial agent queue: {agents_queue}")
+    log.debug("Build fusion graph start")
+    log.debug("Graphs enabled → CG=%s, EG=%s, TDG=%s (include_tdg_edges=%s)",
+              use_concept_graph, use_entity_graph, use_term_definition_graph, include_tdg_edges)
+
+    final_edges: List[_Edge] = _eventic_to_triples(eventic_edges)
+    # 그래프 전체 엣지 키: 라운드마다 새 엣지만 append → 마지막 일괄 중복 제거 불필요
+    seen_edges: Set[Tuple[str, str, str, str]] = {_edge_key(e) for e in final_edges}
+    log.debug("Seed from eventic: %d edges", len(final_edges))
+    # 큐는 (표기, 소문자 키) 쌍: 초기 agent는 추출 시, 이후 target은 enqueue 시 이미 중복 제거됨
+    agents_queue: List[_Agent] = [(a, a.lower()) for a in _extract_agents_from_eventic(eventic_edges)]
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Initial agent queue: %s", [a for a, _ in agents_queue])
+    # 이미 확장한(또는 이번 라운드에 확장할) agent — 라운드를 넘어 재확장 방지
+    visited_agents: Set[str] = {lo for _, lo in agents_queue}
+
+    if not (use_concept_graph or use_entity_graph or use_term_definition_graph):
+        # ablation: 모든 그래프가 꺼져 있으면 라운드 확장 없이 eventic 엣지만 반환
+        log.debug("All graphs disabled → skip expansion rounds")
+        rounds = 0
 
     for round_idx in range(max(0, int(rounds))):
         if not agents_queue:
-            if VERBOSE:
-                print(f"[VERBOSE] Queue empty → stop at round {round_idx+1}")
+            log.debug("Queue empty → stop at round %d", round_idx + 1)
             break
-        if VERBOSE:
-            print(f"\n[VERBOSE] --- Round {round_idx+1} ---")
+        log.debug("--- Round %d ---", round_idx + 1)
 
         step_edges, new_queue = _expand_once(
             agents_queue,
@@ -310,14 +466,13 @@ def build_fusion_graph(
             use_concept_graph=use_concept_graph,
             use_entity_graph=use_entity_graph,
             use_term_definition_graph=use_term_definition_graph,
+            visited=visited_agents,
+            seen_edges=seen_edges,
         )
         final_edges.extend(step_edges)
-        agents_queue = new_queue
-        if VERBOSE:
-            print(f"[VERBOSE] Round {round_idx+1} end → total_edges={len(final_edges)}")
-
-    final_edges = _dedup_edges(final_edges)
-    if VERBOSE:
-        print(f"[VERBOSE] Build fusion graph end → unique_edges={len(final_edges)}")
-    return {"edges": final_edges}
+        agents_queue = new_queue   # visited_agents 는 _expand_once 안에서 갱신됨
+        log.debug("Round %d end → total_edges=%d", round_idx + 1, len(final_edges))
+
+    log.debug("Build fusion graph end → unique_edges=%d", len(final_edges))
+    return {"edges": [_edge_to_dict(e) for e in final_edges]}
 
@@ -0,0 +1,50 @@
+# utils/fusion_graph_builder/_http.py
+"""CG/EG 공용 HTTP 세션: keep-alive + 커넥션 풀 + 일시적 오류 재시도 (+ 디스크 캐시)."""
+from __future__ import annotations
+import threading
+from typing import Dict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .. import _cache
+
+try:
+    import requests_cache  # 선택 의존성: 설치 시 HTTP 응답 디스크 캐시
+except ImportError:
+    requests_cache = None
+
+HTTP_CACHE_PATH = ".cache/kg"       # sqlite 캐시 파일 경로 (requests_cache 사용 시)
+HTTP_CACHE_EXPIRE = 86400           # 캐시 만료(초)
+
+def _new_session(cached: bool) -> requests.Session:
+    if cached and requests_cache is not None:
+        s = requests_cache.CachedSession(HTTP_CACHE_PATH, backend="sqlite", expire_after=HTTP_CACHE_EXPIRE)
+    else:
+        s = requests.Session()
+    s.mount("https://", HTTPAdapter(
+        pool_connections=50,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ))
+    s.headers.update({"Accept-Encoding": "gzip"})
+    return s
+
+# 세션은 첫 사용 시 생성 (import만으로 sqlite 캐시 파일을 만들지 않도록)
+_SESSIONS: Dict[bool, requests.Session] = {}
+_SESSION_LOCK = threading.Lock()
+
+def session() -> requests.Session:
+    """_cache.USE_CACHE=False면 디스크 캐시 없는 세션 사용 (캐시/비캐시 세션 모두 첫 사용 시 생성)."""
+    use_cache = _cache.USE_CACHE
+    s = _SESSIONS.get(use_cache)
+    if s is None:
+        with _SESSION_LOCK:
+            s = _SESSIONS.get(use_cache)
+            if s is None:
+                s = _SESSIONS[use_cache] = _new_session(cached=use_cache)
+    return s
+
+def caches_responses() -> bool:
+    """session()이 응답을 디스크에 저장하는지 (저장 시 본문을 미리 읽으므로 스트리밍 불가)."""
+    return _cache.USE_CACHE and requests_cache is not None
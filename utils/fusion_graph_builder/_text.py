@@ -0,0 +1,12 @@
+# utils/fusion_graph_builder/_text.py
+"""공용 문자열 정규화 (표기용 _norm, 비교 키용 _norm_lower)."""
+import re
+
+_WS = re.compile(r"\s+")
+
+def _norm(s: str) -> str:
+    return _WS.sub(" ", (s or "").strip())
+
+def _norm_lower(s: str) -> str:
+    """비교 키 전용 (표기는 _norm 사용)."""
+    return _norm(s).lower()
@@ -1,8 +1,16 @@
 # utils/fusion_graph_builder/concept_graph_search.py
 from __future__ import annotations
-import requests
+import functools
+import heapq
 from urllib.parse import quote
-from typing import Dict, List, Iterable, Optional
+from typing import Dict, FrozenSet, List, Iterable, Optional, Tuple
+
+from .._json_io import loads as _loads
+from .. import _cache
+from . import _http
+
+CONCEPTNET_API = "https://api.conceptnet.io"
+CONCEPTNET_MAX_PAGES = 2            # top-K 미달 시 view.nextPage 추적 상한(페이지 수)
 
 def _norm_term(term: str) -> str:
     """ConceptNet URI용 정규화: 소문자 + 공백을 '_'로."""
@@ -33,8 +41,8 @@ def fetch_conceptnet_triples(
     Parameters
     ----------
     keyword : 조회할 키워드(영어)
-    limit : API limit (최대 1000 권장 이하, 기본값 100)
-    relations : 필터링할 관계명 집합 (예: {"IsA","CapableOf"})
+    limit : API limit (최대 1000 권장 이하, 기본값 100; max_num 지정 시 max_num*5 로 축소)
+    relations : 필터링할 관계명 집합 (예: {"IsA","CapableOf"}; 하나뿐이면 API rel 파라미터로 전달)
     min_weight : weight의 최소값 (기본값 0.0)
         - ConceptNet weight 범위:
             * 0 ~ 1 : 거의 의미 없는 약한 연결
@@ -44,60 +52,116 @@ def fetch_conceptnet_triples(
             * 20 이상 : 매우 확실한 대표적 관계 (예: dog IsA animal)
     max_num : 최종 반환할 triple 개수 (기본값 None → 무제한)
               weight 높은 순으로 정렬하여 잘라냄
+              (첫 페이지에서 max_num 개를 못 채우면 nextPage 를 최대 CONCEPTNET_MAX_PAGES 까지 조회)
     timeout : 요청 타임아웃(초)
 
     Returns
     -------
     List[Dict]: 삼중항 리스트 (중복 제거, weight 높은 순 정렬)
+                동일 (정규화 term, 파라미터) 조회는 프로세스 내에서 memoize 된다.
     """
-    term = _norm_term(keyword)
-    url = f"https://api.conceptnet.io/c/en/{term}"
-    params = {"limit": max(10, min(int(limit), 1000))}
-
+    fetch = _fetch_conceptnet_cached if _cache.USE_CACHE else _fetch_conceptnet_cached.__wrapped__
     try:
-        resp = requests.get(url, params=params, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json()
+        cached = fetch(
+            _norm_term(keyword),
+            int(limit),
+            frozenset(relations) if relations else None,
+            float(min_weight),
+            max_num,
+            timeout,
+        )
+    except _PartialResult as e:
+        cached = e.triples   # nextPage 실패: 앞 페이지 결과만 반환 (memoize 되지 않음)
     except Exception:
         return []
+    return [{"source": src, "relation": rel, "target": tgt} for src, rel, tgt in cached]
+
+class _PartialResult(Exception):
+    """nextPage 조회 실패 시 이미 모은 결과를 담아 올린다 (lru_cache에 불완전한 결과가 남지 않도록)."""
+    def __init__(self, triples: Tuple[Tuple[str, str, str], ...]):
+        super().__init__("ConceptNet nextPage request failed")
+        self.triples = triples
+
+@functools.lru_cache(maxsize=_cache.MEMO_MAXSIZE)
+def _fetch_conceptnet_cached(
+    term: str,
+    limit: int,
+    relations: Optional[FrozenSet[str]],
+    min_weight: float,
+    max_num: Optional[int],
+    timeout: int,
+) -> Tuple[Tuple[str, str, str], ...]:
+    """
+    fetch_conceptnet_triples 본체 (정규화된 term 기준 memoize).
+    요청 실패 시 예외를 그대로 올려 실패 결과는 캐시되지 않게 한다.
+    nextPage 요청만 실패하면 페이징을 멈추고 모은 결과를 _PartialResult 로 올린다.
+    """
+    if relations and len(relations) == 1:
+        # 단일 관계면 API 측에서 필터 (/c/en/... 조회는 rel 파라미터를 받지 않으므로 /query 사용)
+        url = f"{CONCEPTNET_API}/query?node=/c/en/{term}&rel=/r/{next(iter(relations))}"
+    else:
+        url = f"{CONCEPTNET_API}/c/en/{term}"
+    api_limit = min(limit, 1000)
+    if max_num is not None:
+        # 상위 max_num 개만 쓰므로 과다 수신 방지 (ConceptNet은 weight 내림차순으로 반환)
+        api_limit = min(api_limit, max_num * 5)
+    params = {"limit": max(10, api_limit)}
 
-    triples: List[Dict[str, str]] = []
+    triples: List[Tuple[str, str, str, float]] = []
     seen = set()
 
-    for edge in data.get("edges", []):
-        w = edge.get("weight", 0)
-        if w < min_weight:
-            continue
-        rel = _rel_of(edge.get("rel", {}))
-        if relations and rel not in relations:
-            continue
-
-        src = _label_of(edge.get("start", {}))
-        tgt = _label_of(edge.get("end", {}))
-        sig = (src.lower(), rel, tgt.lower())
-        if sig in seen:
-            continue
-
-        triples.append({
-            "source": src,
-            "relation": rel,
-            "target": tgt,
-            "weight": w  # weight도 같이 반환
-        })
-        seen.add(sig)
-
-    # weight 높은 순으로 정렬
-    triples.sort(key=lambda x: x["weight"], reverse=True)
-
-    # max_num 제한 적용
+    partial = False
+    for page in range(CONCEPTNET_MAX_PAGES):
+        try:
+            resp = _http.session().get(url, params=params, timeout=timeout)
+            resp.raise_for_status()
+            data = _loads(resp.content)
+        except Exception:
+            if page == 0:
+                raise
+            partial = True
+            break
+        edges = data.get("edges", [])
+
+        for edge in edges:
+            w = edge.get("weight", 0)
+            if w < min_weight:
+                continue
+            rel = _rel_of(edge.get("rel", {}))
+            if relations and rel not in relations:
+                continue
+
+            src = _label_of(edge.get("start", {}))
+            tgt = _label_of(edge.get("end", {}))
+            sig = (src.lower(), rel, tgt.lower())
+            if sig in seen:
+                continue
+
+            triples.append((src, rel, tgt, w))
+            seen.add(sig)
+
+        # 다음 페이지는 top-K가 아직 채워지지 않았고, 이 페이지 마지막(최저 weight) 엣지가
+        # min_weight 이상이라 다음 페이지에도 통과 엣지가 있을 수 있을 때만 조회
+        next_page = (data.get("view") or {}).get("nextPage")
+        if (
+            not next_page or not edges or max_num is None
+            or len(triples) >= max_num
+            or edges[-1].get("weight", 0) < min_weight
+        ):
+            break
+        url, params = f"{CONCEPTNET_API}{next_page}", None
+
+    # weight 높은 순 정렬 + max_num 제한 (top-K만 필요하면 heap으로 선택)
     if max_num is not None:
-        triples = triples[:max_num]
+        triples = heapq.nlargest(max_num, triples, key=lambda x: x[3])
+    else:
+        triples.sort(key=lambda x: x[3], reverse=True)
 
     # 🔑 weight 항목 제거
-    for t in triples:
-        t.pop("weight", None)
-
-    return triples
+    result = tuple((src, rel, tgt) for src, rel, tgt, _ in triples)
+    if partial:
+        raise _PartialResult(result)
+    return result
 
 
 # 간단 테스트
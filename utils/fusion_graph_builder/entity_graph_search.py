@@ -1,24 +1,46 @@
 # utils/fusion_graph_builder/entity_graph_search.py
 from __future__ import annotations
 import re
-import json
-import traceback
-import requests
-from typing import Dict, List, Iterable, Optional
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Iterable, Iterator, Optional, Set, Tuple
 from urllib.parse import quote
 
+from .._json_io import loads as _loads
+from .. import _cache
+from . import _http
+
+try:
+    import ijson  # 선택 의존성: 설치 시 SPARQL 결과 JSON 스트리밍 파싱
+except ImportError:
+    ijson = None
+
 DBPEDIA_LOOKUP = "https://lookup.dbpedia.org/api/search"
 DBPEDIA_SPARQL = "https://dbpedia.org/sparql"
+SPARQL_MAX_ROWS = 10000  # DBpedia Virtuoso 결과 행 상한
+
+LOOKUP_MAX_WORKERS = 8              # 배치 조회 시 동시 Lookup 요청 수
+
+# 스트리밍 파싱 여부: 캐시 세션은 응답 본문을 미리 읽어 저장하므로 스트리밍 불가
+def _stream_bindings() -> bool:
+    return ijson is not None and not _http.caches_responses()
+
+# keyword → URI 해석용 스레드 풀 (Lookup API는 배치 질의를 지원하지 않음)
+_LOOKUP_POOL = ThreadPoolExecutor(max_workers=LOOKUP_MAX_WORKERS, thread_name_prefix="dbpedia-lookup")
 
 # ----------------------------------------------------
 # 내부 유틸 & 로깅
 # ----------------------------------------------------
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_WS = re.compile(r"\s+")
+
 def _normalize_keyword_for_dbr(keyword: str) -> str:
     """
     Lookup 실패 시 폴백용: "new york city" -> "New_York_City"
     DBpedia 리소스 로컬명 관례에 맞춰 단어별 capitalize + '_' 연결
     """
-    tokenized = re.findall(r"[A-Za-z0-9]+", keyword.strip().lower())
+    tokenized = _WORD.findall(keyword.strip().lower())
     return "_".join(t.capitalize() for t in tokenized) if tokenized else keyword.strip()
 
 def _localname(uri: str) -> str:
@@ -36,9 +58,20 @@ def _headers_sparql_results_json():
     # Ref: SPARQL 1.1 Query Results JSON Format
     return {"Accept": "application/sparql-results+json"}
 
-def dbg(verbose: bool, *args):
+log = logging.getLogger(__name__)
+
+def dbg(verbose: bool, msg: str, *args, exc_info: bool = False):
+    """verbose=True일 때만 DEBUG 로그. msg는 %-포맷 → 인자는 출력 시점에만 문자열화."""
     if verbose:
-        print("[DBG]", *args)
+        log.debug(msg, *args, exc_info=exc_info)
+
+def _iter_bindings(resp) -> Iterator[Dict]:
+    """SPARQL 결과셋의 binding을 순서대로 내보낸다 (스트리밍 가능하면 ijson, 아니면 전체 본문 파싱)."""
+    if _stream_bindings():
+        resp.raw.decode_content = True  # gzip 해제된 본문을 파서에 전달
+        yield from ijson.items(resp.raw, "results.bindings.item")
+        return
+    yield from (_loads(resp.content) or {}).get("results", {}).get("bindings", [])
 
 # 특수기호 제거: relation 정제용
 _REL_ALLOWED = re.compile(r"[^A-Za-z0-9_ ]+")  # 영숫자/언더스코어/공백만 허용
@@ -50,46 +83,25 @@ def _clean_relation(text: str) -> str:
     t = (text or "").strip()
     t = _REL_ALLOWED.sub("", t)
     # 다중 공백 축소
-    t = re.sub(r"\s+", " ", t).strip()
+    t = _WS.sub(" ", t).strip()
     return t
 
 # ----------------------------------------------------
 # 0) 위키 메타 관계 식별 (기본 제외)
 # ----------------------------------------------------
-WIKI_REL_LOCAL_PREFIX = "wikiPage"
-WIKI_REL_LOCAL_BLOCKLIST = {
-    # 위키 링크/템플릿/리다이렉트/리비전/ID/인터랭크 등 (Reserved for DBpedia)
-    "wikiPageWikiLink",
-    "wikiPageExternalLink",
-    "wikiPageRedirects",
-    "wikiPageDisambiguates",
-    "wikiPageInterLanguageLink",
-    "wikiPageUsesTemplate",
-    "wikiPageEditLink",
-    "wikiPageHistoryLink",
-    "wikiPageRevisionLink",
-    "wikiPageWikiLinkText",
-    "wikiPageID",
-    "wikiPageRevisionID",
-    "wikidataSplitIri",
-    "22-rdf-syntax-ns#type",
-    "rdf-schema#seeAlso",
-    "prov#wasDerivedFrom",
-    "owl#sameAs",
-    "df-schema#label",
-    "thumbnail",
-}
-
-def _is_wiki_relation(p_uri: str, rel_local: str) -> bool:
-    """DBpedia의 위키 내비게이션/메타 성격의 관계면 True."""
-    if not rel_local:
-        return False
-    if rel_local in WIKI_REL_LOCAL_BLOCKLIST:
-        return True
-    if rel_local.startswith(WIKI_REL_LOCAL_PREFIX):
-        return True
-    # URI 수준 보수적 체크
-    return "dbpedia.org/ontology/wikiPage" in (p_uri or "")
+# URI 수준 위키 메타 관계 접두사 (SPARQL FILTER 생성용)
+_WIKI_URI_PREFIXES = (
+    "http://dbpedia.org/ontology/wikiPage",
+    "http://dbpedia.org/property/wikiPage",
+)
+
+# SPARQL 단계에서 위키 메타 관계를 미리 걸러내는 FILTER (exclude_wiki=True 시 사용)
+_SPARQL_WIKI_FILTER = (
+    "FILTER ("
+    + "".join(f'!STRSTARTS(STR(?p), "{prefix}")\n        && ' for prefix in _WIKI_URI_PREFIXES)
+    + "?p NOT IN (rdf:type, rdfs:seeAlso, owl:sameAs, prov:wasDerivedFrom,\n"
+    "                      dbo:thumbnail, dbo:wikidataSplitIri))"
+)
 
 # ----------------------------------------------------
 # 1) 키워드 → DBpedia 리소스 URI 해석
@@ -98,76 +110,339 @@ def resolve_dbpedia_entity(keyword: str, *, timeout: int = 30, verbose: bool = F
     """
     DBpedia Lookup API로 키워드를 엔티티 URI로 해석.
     실패하면 dbr:{Normalized} 폴백을 시도 (존재 여부를 SPARQL로 검증).
+    Lookup/ASK 결과는 프로세스 내에서 memoize 된다(요청 실패는 캐시하지 않음).
     """
-    dbg(verbose, f"resolve_dbpedia_entity() keyword={keyword!r}")
-    try:
-        params = {"query": keyword, "maxResults": 5, "format": "json"}
-        dbg(verbose, "GET", DBPEDIA_LOOKUP, params)
-        resp = requests.get(DBPEDIA_LOOKUP, params=params, headers=_headers_json(), timeout=timeout)
-        dbg(verbose, "lookup status_code:", resp.status_code)
-        if resp.ok:
-            data = resp.json() or {}
-            results = data.get("docs") or []
-            dbg(verbose, f"lookup results len={len(results)}")
-            for i, r in enumerate(results):
-                uri = None
-                for key in ("resource", "uri"):
-                    val = r.get(key)
-                    if isinstance(val, list) and val:
-                        uri = val[0]
-                        break
-                    if isinstance(val, str):
-                        uri = val
-                        break
-                dbg(verbose, f"candidate[{i}] uri={uri}")
-                if uri and isinstance(uri, str) and uri.startswith("http"):
-                    dbg(verbose, "-> chosen uri:", uri)
-                    return uri
-        else:
-            dbg(verbose, "lookup not ok. text:", resp.text[:500])
-    except Exception as e:
-        dbg(verbose, "lookup exception:", repr(e))
-        if verbose:
-            traceback.print_exc()
+    dbg(verbose, "resolve_dbpedia_entity() keyword=%r", keyword)
+    uri = _lookup_or_none(keyword, timeout=timeout, verbose=verbose)
+    if uri:
+        return uri
 
     # 폴백: dbr:Normalized 로컬명 생성 후 존재 검증
-    local = _normalize_keyword_for_dbr(keyword)
-    candidate = f"http://dbpedia.org/resource/{quote(local)}"
-    dbg(verbose, f"fallback candidate={candidate}")
+    candidate = _fallback_resource_uri(keyword)
+    dbg(verbose, "fallback candidate=%s", candidate)
     exists = _check_resource_exists(candidate, timeout=timeout, verbose=verbose)
-    dbg(verbose, "fallback exists?", exists)
+    dbg(verbose, "fallback exists? %s", exists)
     return candidate if exists else None
 
+def resolve_dbpedia_entities(keywords: List[str], *, timeout: int = 30, verbose: bool = False) -> Dict[str, Optional[str]]:
+    """
+    resolve_dbpedia_entity 의 배치 버전: {keyword: uri 또는 None}.
+    Lookup은 keyword별로 병렬 실행하고, Lookup이 URI를 고른 keyword는 존재 검증을 생략한다.
+    나머지 keyword의 dbr:{Normalized} 폴백은 SPARQL 1회로 한꺼번에 존재 검증.
+    """
+    uris = _LOOKUP_POOL.map(lambda kw: _lookup_or_none(kw, timeout=timeout, verbose=verbose), keywords)
+    resolved: Dict[str, Optional[str]] = dict(zip(keywords, uris))
+
+    fallback_of = {kw: _fallback_resource_uri(kw) for kw, uri in resolved.items() if not uri}
+    if fallback_of:
+        dbg(verbose, "fallback candidates=%s", list(fallback_of.values()))
+        existing = _existing_resources(set(fallback_of.values()), timeout=timeout, verbose=verbose)
+        for kw, candidate in fallback_of.items():
+            resolved[kw] = candidate if candidate in existing else None
+    return resolved
+
+def _lookup_or_none(keyword: str, *, timeout: int, verbose: bool) -> Optional[str]:
+    try:
+        lookup = _lookup_dbpedia_uri if _cache.USE_CACHE else _lookup_dbpedia_uri.__wrapped__
+        uri = lookup(keyword, timeout)
+        dbg(verbose, "lookup %r chosen uri: %s", keyword, uri)
+        return uri
+    except Exception as e:
+        dbg(verbose, "lookup exception: %r", e, exc_info=True)
+        return None
+
+def _fallback_resource_uri(keyword: str) -> str:
+    """Lookup 실패 시 사용할 dbr:{Normalized} 후보 URI."""
+    return f"http://dbpedia.org/resource/{quote(_normalize_keyword_for_dbr(keyword))}"
+
+@functools.lru_cache(maxsize=_cache.MEMO_MAXSIZE)
+def _lookup_dbpedia_uri(keyword: str, timeout: int) -> Optional[str]:
+    """Lookup API 결과 중 첫 http URI (없으면 None). 요청 실패 시 예외."""
+    params = {"query": keyword, "maxResults": 5, "format": "json"}
+    resp = _http.session().get(DBPEDIA_LOOKUP, params=params, headers=_headers_json(), timeout=timeout)
+    resp.raise_for_status()
+    data = _loads(resp.content) or {}
+    for r in data.get("docs") or []:
+        uri = None
+        for key in ("resource", "uri"):
+            val = r.get(key)
+            if isinstance(val, list) and val:
+                uri = val[0]
+                break
+            if isinstance(val, str):
+                uri = val
+                break
+        if uri and isinstance(uri, str) and uri.startswith("http"):
+            return uri
+    return None
+
 def _check_resource_exists(uri: str, *, timeout: int = 30, verbose: bool = False) -> bool:
     """
     간단 존재 확인: ASK { <uri> ?p ?o } 를 SPARQL로 질의.
     """
-    ask = f"ASK WHERE {{ <{uri}> ?p ?o }}"
     try:
-        dbg(verbose, "ASK query:", ask)
-        resp = requests.get(
+        ask = _ask_resource_exists if _cache.USE_CACHE else _ask_resource_exists.__wrapped__
+        exists = ask(uri, timeout)
+        dbg(verbose, "ASK result: %s", exists)
+        return exists
+    except Exception as e:
+        dbg(verbose, "ASK exception: %r", e, exc_info=True)
+        return False
+
+def _existing_resources(uris: Iterable[str], *, timeout: int = 30, verbose: bool = False) -> Set[str]:
+    """
+    여러 URI의 존재 여부를 SPARQL 1회로 확인 → 존재하는 URI 집합.
+    SELECT ?s { VALUES ?s { ... } FILTER EXISTS { ?s ?p ?o } }
+    """
+    uris = list(uris)
+    if not uris:
+        return set()
+    values = " ".join(f"<{u}>" for u in uris)
+    query = f"SELECT ?s WHERE {{ VALUES ?s {{ {values} }} FILTER EXISTS {{ ?s ?p ?o }} }}"
+    try:
+        dbg(verbose, "EXISTS query: %s", query)
+        resp = _http.session().get(
             DBPEDIA_SPARQL,
-            params={"query": ask, "format": "application/sparql-results+json"},
+            params={"query": query, "format": "application/sparql-results+json"},
             timeout=timeout,
             headers=_headers_sparql_results_json(),  # 중요: 결과셋 JSON 헤더
         )
-        dbg(verbose, "ASK status_code:", resp.status_code)
-        if resp.ok:
-            res = resp.json()
-            dbg(verbose, "ASK result:", res)
-            return bool(res.get("boolean"))
-        else:
-            dbg(verbose, "ASK not ok. text:", resp.text[:500])
+        resp.raise_for_status()
+        bindings = (_loads(resp.content) or {}).get("results", {}).get("bindings", [])
+        existing = {b.get("s", {}).get("value", "") for b in bindings}
+        dbg(verbose, "EXISTS result: %s", existing)
+        return existing
     except Exception as e:
-        dbg(verbose, "ASK exception:", repr(e))
-        if verbose:
-            traceback.print_exc()
-        return False
-    return False
+        dbg(verbose, "EXISTS exception: %r", e, exc_info=True)
+        return set()
+
+@functools.lru_cache(maxsize=_cache.MEMO_MAXSIZE)
+def _ask_resource_exists(uri: str, timeout: int) -> bool:
+    """_check_resource_exists 본체 (memoize). 요청 실패 시 예외."""
+    ask = f"ASK WHERE {{ <{uri}> ?p ?o }}"
+    resp = _http.session().get(
+        DBPEDIA_SPARQL,
+        params={"query": ask, "format": "application/sparql-results+json"},
+        timeout=timeout,
+        headers=_headers_sparql_results_json(),  # 중요: 결과셋 JSON 헤더
+    )
+    resp.raise_for_status()
+    return bool(_loads(resp.content).get("boolean"))
 
 # ----------------------------------------------------
 # 2) 엔티티 → outgoing triples 조회
 # ----------------------------------------------------
+def _binding_to_triple(
+    b: Dict,
+    source_label: str,
+    *,
+    relations: Optional[Iterable[str]],
+) -> Optional[Dict[str, str]]:
+    """
+    SPARQL binding 한 건 → {'source','relation','target'}. 제외 대상이면 None.
+    (라벨은 (?s ?p ?o) 그룹별 SAMPLE 값인 ?pLabelX / ?oLabelX)
+    (위키 메타 관계는 질의 단계의 _SPARQL_WIKI_FILTER 로 이미 제외됨)
+    """
+    p_uri = b.get("p", {}).get("value", "")
+    p_label = b.get("pLabelX", {}).get("value")
+    o_val = b.get("o", {}).get("value", "")
+    o_type = b.get("o", {}).get("type", "")
+    o_label = b.get("oLabelX", {}).get("value")
+
+    rel_local = _localname(p_uri)
+
+    # 사용자 지정 관계 필터 (localname 기준)
+    if relations and rel_local not in relations:
+        return None
+
+    # relation 텍스트: 라벨 우선, 없으면 로컬명 → 특수기호 제거
+    relation_text_raw = p_label or rel_local
+    relation_text = _clean_relation(relation_text_raw)
+    if not relation_text:
+        # 전부 제거되어 빈 문자열이면 스킵
+        return None
+
+    # target 텍스트
+    if o_type == "uri":
+        target_text = (o_label or _localname(o_val)).replace("_", " ")
+    else:
+        target_text = o_label or o_val  # literal
+
+    return {"source": source_label, "relation": relation_text, "target": target_text}
+
+def _collect_uri_triples(
+    uris: List[str],
+    *,
+    buckets: Dict[str, List[Dict[str, str]]],
+    seen: Dict[str, set],
+    per_uri_limit: int,
+    relations: Optional[Iterable[str]],
+    max_num: Optional[int],
+    timeout: int,
+    verbose: bool,
+    exclude_wiki: bool,
+) -> Tuple[Dict[str, int], bool]:
+    """
+    uris 의 outgoing triple 을 SPARQL 1회로 조회하여 buckets/seen 에 제자리로 누적.
+    반환: (URI별 수신 행 수, 전체 LIMIT 에 걸려 잘렸는지 여부).
+    """
+    # 패턴 순서 유지: VALUES(?s 바인딩) → ?s ?p ?o → FILTER → OPTIONAL 라벨.
+    # ?s가 먼저 묶여야 Virtuoso가 전체 triple 스캔 없이 주어 인덱스로 접근한다.
+    # 버킷 분배는 ?s 값으로 하므로 ORDER BY는 두지 않는다(정렬 비용 회피).
+    values = " ".join(f"<{u}>" for u in uris)
+    wiki_filter = _SPARQL_WIKI_FILTER if exclude_wiki else ""
+    row_limit = min(per_uri_limit * len(uris), SPARQL_MAX_ROWS)
+    sparql = f"""
+    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    PREFIX owl: <http://www.w3.org/2002/07/owl#>
+    PREFIX prov: <http://www.w3.org/ns/prov#>
+    PREFIX dbo: <http://dbpedia.org/ontology/>
+    SELECT ?s ?p (SAMPLE(?pLabel) AS ?pLabelX) ?o (SAMPLE(?oLabel) AS ?oLabelX) WHERE {{
+      VALUES ?s {{ {values} }}
+      ?s ?p ?o .
+      {wiki_filter}
+      OPTIONAL {{ ?p rdfs:label ?pLabel . FILTER (LANGMATCHES(LANG(?pLabel), "en")) }}
+      OPTIONAL {{ ?o rdfs:label ?oLabel . FILTER (LANGMATCHES(LANG(?oLabel), "en")) }}
+    }}
+    GROUP BY ?s ?p ?o
+    LIMIT {row_limit}
+    """.strip()
+
+    rows_of: Dict[str, int] = {u: 0 for u in uris}
+    source_labels = {u: _localname(u).replace("_", " ") for u in uris}
+    # max_num 미달 버킷 수 (0이 되면 수신 중단)
+    open_buckets = sum(1 for u in uris if max_num is None or len(buckets[u]) < max_num)
+    rows_read = 0
+
+    try:
+        dbg(verbose, "SPARQL query:\n%s", sparql)
+        with _http.session().get(
+            DBPEDIA_SPARQL,
+            params={"query": sparql, "format": "application/sparql-results+json"},
+            timeout=timeout,
+            headers=_headers_sparql_results_json(),  # 중요: 결과셋 JSON 헤더
+            stream=_stream_bindings(),
+        ) as resp:
+            dbg(verbose, "SPARQL status_code: %s", resp.status_code)
+            if not resp.ok:
+                dbg(verbose, "SPARQL not ok. text: %.800s", resp.text)
+                return rows_of, False
+
+            idx = -1
+            for idx, b in enumerate(_iter_bindings(resp)):
+                rows_read = idx + 1
+                try:
+                    s_uri = b.get("s", {}).get("value", "")
+                    if s_uri not in rows_of or rows_of[s_uri] >= per_uri_limit:
+                        continue  # URI당 per_uri_limit 행까지만 사용 (단건 질의와 동일한 상한)
+                    rows_of[s_uri] += 1
+                    bucket = buckets[s_uri]
+                    if max_num is not None and len(bucket) >= max_num:
+                        continue
+
+                    triple = _binding_to_triple(b, source_labels[s_uri], relations=relations)
+                    if triple is None:
+                        continue
+
+                    sig = (triple["source"].lower(), triple["relation"], (triple["target"] or "").lower())
+                    if sig in seen[s_uri]:
+                        continue
+
+                    bucket.append(triple)
+                    seen[s_uri].add(sig)
+
+                    if verbose and (idx < 5):  # 초반 5개 샘플 로그
+                        log.debug("triple: %s", triple)
+
+                    if max_num is not None and len(bucket) >= max_num:
+                        open_buckets -= 1
+                        if open_buckets == 0:
+                            dbg(verbose, "max_num reached for all URIs: %s", max_num)
+                            break
+
+                except Exception as e:
+                    dbg(verbose, "binding[%d] parse exception: %r", idx, e, exc_info=True)
+                    continue
+            dbg(verbose, "bindings read=%d (streamed=%s)", idx + 1, _stream_bindings())
+    except Exception as e:
+        # 스트리밍 도중 실패하면 그때까지 모은 triple은 유지
+        dbg(verbose, "SPARQL exception: %r", e, exc_info=True)
+
+    return rows_of, rows_read >= row_limit
+
+def fetch_dbpedia_triples_batch(
+    keywords: List[str],
+    *,
+    relations: Optional[Iterable[str]] = None,
+    max_num: Optional[int] = None,
+    limit: int = 200,
+    timeout: int = 30,
+    verbose: bool = False,
+    exclude_wiki: bool = True,
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    여러 keyword를 한 번에 처리하는 배치 버전.
+    1) 각 keyword를 엔티티 URI로 해석 (resolve_dbpedia_entities: Lookup 병렬 + 폴백 검증 SPARQL 1회)
+    2) VALUES ?s { <u1> ... <uN> } 단일 SPARQL 질의로 모든 URI의 outgoing triple 조회
+       (GROUP BY ?s ?p ?o 로 다국어 라벨 등에 의한 중복 행은 서버에서 제거)
+    3) 결과 binding을 ?s 기준으로 keyword별로 분배
+       (ijson 설치 시 응답을 스트리밍 파싱하며, 모든 URI가 max_num에 도달하면 수신 중단)
+
+    Parameters
+    ----------
+    keywords : 조회할 키워드 목록(영어 자연어)
+    limit : URI 하나당 SPARQL LIMIT (기본 200; 상한 2000). 전체 LIMIT = URI 수 × limit
+            (전체 LIMIT 에 걸려 limit 행을 받지 못한 URI는 개별 재질의)
+    그 외 파라미터는 fetch_dbpedia_triples 와 동일 (max_num 은 keyword별 상한)
+
+    Returns
+    -------
+    Dict[str, List[Dict[str,str]]] : {keyword: [(source, relation, target), ...]}
+                                      해석 실패한 keyword는 빈 리스트.
+    """
+    dbg(verbose, "fetch_dbpedia_triples_batch() keywords=%r, limit=%s, max_num=%s, exclude_wiki=%s",
+        keywords, limit, max_num, exclude_wiki)
+    out: Dict[str, List[Dict[str, str]]] = {kw: [] for kw in keywords}
+
+    # 1) keyword → URI (Lookup 병렬 + 폴백 존재 검증 1회; 같은 URI로 해석되는 keyword가 여럿일 수 있음)
+    kws_of_uri: Dict[str, List[str]] = {}
+    for kw, uri in resolve_dbpedia_entities(list(out), timeout=timeout, verbose=verbose).items():
+        dbg(verbose, "resolved %r -> %s", kw, uri)
+        if uri:
+            kws_of_uri.setdefault(uri, []).append(kw)
+    if not kws_of_uri:
+        dbg(verbose, "No URI resolved. Returning empty buckets.")
+        return out
+
+    # 2) 단일 SPARQL 질의 → ?s 기준으로 URI 버킷에 분배 (URI별 중복 제거 + max_num 적용)
+    per_uri_limit = int(max(1, min(limit, 2000)))
+    buckets: Dict[str, List[Dict[str, str]]] = {u: [] for u in kws_of_uri}
+    seen: Dict[str, set] = {u: set() for u in kws_of_uri}
+    collect = functools.partial(
+        _collect_uri_triples, buckets=buckets, seen=seen, per_uri_limit=per_uri_limit,
+        relations=relations, max_num=max_num, timeout=timeout, verbose=verbose, exclude_wiki=exclude_wiki,
+    )
+    rows_of, truncated = collect(list(kws_of_uri))
+
+    # 전체 LIMIT에 걸려 잘렸다면, 행이 많은 URI 하나가 LIMIT을 독점했을 수 있음 →
+    # URI당 per_uri_limit 행을 받지 못했고 max_num도 못 채운 URI만 개별 재질의 (URI별 보장 유지)
+    if truncated and len(kws_of_uri) > 1:
+        starved = [
+            u for u in kws_of_uri
+            if rows_of[u] < per_uri_limit and (max_num is None or len(buckets[u]) < max_num)
+        ]
+        if starved:
+            dbg(verbose, "batch LIMIT reached → re-query %d URI(s) individually", len(starved))
+            list(_LOOKUP_POOL.map(lambda u: collect([u]), starved))
+
+    # URI 버킷 → keyword (같은 URI를 공유하는 keyword에는 사본을 넘김)
+    for uri, uri_kws in kws_of_uri.items():
+        for kw in uri_kws:
+            out[kw] = [dict(t) for t in buckets[uri]]
+        dbg(verbose, "triples count[%s]=%d", uri, len(buckets[uri]))
+    return out
+
 def fetch_dbpedia_triples(
     keyword: str,
     *,
@@ -181,6 +456,7 @@ def fetch_dbpedia_triples(
     """
     DBpedia에서 keyword(영어)를 엔티티로 해석하고, 그 엔티티의 outgoing triple을
     [{'source': ..., 'relation': ..., 'target': ...}, ...] 로 반환.
+    (단일 keyword용 래퍼: fetch_dbpedia_triples_batch([keyword]) 와 동일)
 
     Parameters
     ----------
@@ -191,119 +467,29 @@ def fetch_dbpedia_triples(
     max_num : 최종 반환할 최대 triple 개수 (기본 None → 제한 없음)
     limit : SPARQL LIMIT (기본 200; 상한 2000)
     timeout : 요청 타임아웃(초)
-    verbose : True면 단계별 디버깅 로그 출력
-    exclude_wiki : True면 wikiPage* 등 위키 메타 관계 제외
+    verbose : True면 단계별 디버깅 로그 출력 (logging DEBUG 레벨, 로거 이름은 모듈명)
+    exclude_wiki : True면 wikiPage* 등 위키 메타 관계 제외 (SPARQL FILTER로 서버 측에서 제외)
 
     Returns
     -------
     List[Dict[str,str]] : (source, relation, target) 리스트. 라벨은 영어 우선.
     """
-    dbg(verbose, f"fetch_dbpedia_triples() keyword={keyword!r}, limit={limit}, max_num={max_num}, exclude_wiki={exclude_wiki}")
-    uri = resolve_dbpedia_entity(keyword, timeout=timeout, verbose=verbose)
-    dbg(verbose, "resolved uri:", uri)
-    if not uri:
-        dbg(verbose, "No URI resolved. Returning [].")
-        return []
-
-    sparql = f"""
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    SELECT ?p ?pLabel ?o ?oLabel WHERE {{
-      <{uri}> ?p ?o .
-      OPTIONAL {{ ?p rdfs:label ?pLabel FILTER (lang(?pLabel) = 'en') }}
-      OPTIONAL {{ ?o rdfs:label ?oLabel FILTER (lang(?oLabel) = 'en') }}
-    }} LIMIT {int(max(1, min(limit, 2000)))}
-    """.strip()
-
-    try:
-        dbg(verbose, "SPARQL query:\n" + sparql)
-        resp = requests.get(
-            DBPEDIA_SPARQL,
-            params={"query": sparql, "format": "application/sparql-results+json"},
-            timeout=timeout,
-            headers=_headers_sparql_results_json(),  # 중요: 결과셋 JSON 헤더
-        )
-        dbg(verbose, "SPARQL status_code:", resp.status_code)
-        if not resp.ok:
-            dbg(verbose, "SPARQL not ok. text:", resp.text[:800])
-            return []
-        data = resp.json()
-        if verbose:
-            print("[DBG] SPARQL raw keys:", list(data.keys()))
-            print("[DBG] SPARQL head:", data.get("head"))
-            print("[DBG] SPARQL sample binding:", (data.get("results", {}).get("bindings") or [None])[:1])
-    except Exception as e:
-        dbg(verbose, "SPARQL exception:", repr(e))
-        if verbose:
-            traceback.print_exc()
-        return []
-
-    triples: List[Dict[str, str]] = []
-    source_label = _localname(uri).replace("_", " ")
-    seen = set()
-    bindings = data.get("results", {}).get("bindings", [])
-    dbg(verbose, f"bindings len={len(bindings)}")
-
-    for idx, b in enumerate(bindings):
-        try:
-            p_uri = b.get("p", {}).get("value", "")
-            p_label = b.get("pLabel", {}).get("value")
-            o_val = b.get("o", {}).get("value", "")
-            o_type = b.get("o", {}).get("type", "")
-            o_label = b.get("oLabel", {}).get("value")
-
-            rel_local = _localname(p_uri)
-
-            # 1) 위키 메타 관계 제외 (옵션)
-            if exclude_wiki and _is_wiki_relation(p_uri, rel_local):
-                if verbose:
-                    print("[DBG] skip wiki-meta relation:", rel_local)
-                continue
-
-            # 2) 사용자 지정 관계 필터 (localname 기준)
-            if relations and rel_local not in relations:
-                continue
-
-            # relation 텍스트: 라벨 우선, 없으면 로컬명 → 특수기호 제거
-            relation_text_raw = p_label or rel_local
-            relation_text = _clean_relation(relation_text_raw)
-            if not relation_text:
-                # 전부 제거되어 빈 문자열이면 스킵
-                continue
-
-            # target 텍스트
-            if o_type == "uri":
-                target_text = (o_label or _localname(o_val)).replace("_", " ")
-            else:
-                target_text = o_label or o_val  # literal
-
-            sig = (source_label.lower(), relation_text, (target_text or "").lower())
-            if sig in seen:
-                continue
-
-            triples.append({"source": source_label, "relation": relation_text, "target": target_text})
-            seen.add(sig)
-
-            if verbose and (idx < 5):  # 초반 5개 샘플 로그
-                print("[DBG] triple:", triples[-1])
-
-            if max_num is not None and len(triples) >= max_num:
-                dbg(verbose, f"max_num reached: {max_num}")
-                break
-
-        except Exception as e:
-            dbg(verbose, f"binding[{idx}] parse exception: {repr(e)}")
-            if verbose:
-                traceback.print_exc()
-            continue
-
-    dbg(verbose, f"triples count={len(triples)}")
-    return triples
+    return fetch_dbpedia_triples_batch(
+        [keyword],
+        relations=relations,
+        max_num=max_num,
+        limit=limit,
+        timeout=timeout,
+        verbose=verbose,
+        exclude_wiki=exclude_wiki,
+    )[keyword]
 
 # ----------------------------------------------------
 # 간단 실행 진단
 # ----------------------------------------------------
 if __name__ == "__main__":
     # 실행 시 기본 디버그 ON
+    logging.basicConfig(level=logging.DEBUG, format="[DBG] %(message)s")
     keyword = "Elon Musk"
     print(f"[RUN] fetch_dbpedia_triples('{keyword}') with verbose=True (exclude_wiki=True)")
     out = fetch_dbpedia_triples(keyword, relations=None, max_num=10, limit=2000, verbose=True, exclude_wiki=True)
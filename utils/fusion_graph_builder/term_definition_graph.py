@@ -1,63 +1,101 @@
 # utils/fusion_graph_builder/term_definition_graph.py
 from __future__ import annotations
-import json
-import re
-from typing import Dict, List
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
 
+from .._json_io import loads as _loads, dumps as _dumps
+from .. import _cache
+from .._openai_client import get_client as _get_client
+from ._text import _norm, _norm_lower
+
+try:
+    import diskcache  # 선택 의존성: 설치 시 정의 결과 디스크 캐시
+except ImportError:
+    diskcache = None
+
 load_dotenv() 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+CACHE_DIR = ".cache/tdg"   # 키워드별 정의 캐시 (diskcache 설치 시)
+CACHE_EXPIRE = 86400 * 30  # 디스크 캐시 만료(초)
+
+# ------------------------------
+# 캐시: 프로세스 내 LRU + 디스크 (키: tdg:{model}:{프롬프트 해시}:{정규화 소문자 키워드} → target)
+#  - 단일/배치 경로는 같은 정의를 공유하므로 두 프롬프트를 함께 해시 → 어느 쪽을 고쳐도 기존 항목 무효화
+#  - 배치 호출은 키워드별로 hit/miss를 나눠야 하므로 lru_cache 대신 OrderedDict LRU 사용
+#  - 정의 실패(빈 target)는 캐시하지 않음
+# ------------------------------
+_MEMO: "OrderedDict[str, str]" = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+_CACHE = None
+
+def _get_cache():
+    global _CACHE
+    if _CACHE is None and diskcache is not None:
+        _CACHE = diskcache.Cache(CACHE_DIR)
+    return _CACHE
+
+def _cache_key(keyword: str, model: str) -> str:
+    return f"tdg:{model}:{_PROMPT_TAG}:{_norm_lower(keyword)}"
+
+def _cache_get(key: str) -> Optional[str]:
+    if not _cache.USE_CACHE:
+        return None
+    with _MEMO_LOCK:
+        target = _MEMO.get(key)
+        if target is not None:
+            _MEMO.move_to_end(key)
+            return target
+    cache = _get_cache()
+    target = cache.get(key) if cache is not None else None
+    if target:
+        _memo_put(key, target)
+    return target or None
+
+def _memo_put(key: str, target: str) -> None:
+    with _MEMO_LOCK:
+        _MEMO[key] = target
+        _MEMO.move_to_end(key)
+        if len(_MEMO) > _cache.MEMO_MAXSIZE:
+            _MEMO.popitem(last=False)
+
+def _cache_put(key: str, target: str) -> None:
+    if not _cache.USE_CACHE or not target:
+        return
+    _memo_put(key, target)
+    cache = _get_cache()
+    if cache is not None:
+        cache.set(key, target, expire=CACHE_EXPIRE)
+
 # ------------------------------
 # 파싱: 단일 triple 전용
 # ------------------------------
-def _norm(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+def _from_dict(d: dict) -> Dict[str, str] | None:
+    src = _norm(str(d.get("source", "")))
+    rel = _norm(str(d.get("relation", "")))
+    tgt = _norm(str(d.get("target", "")))
+    if src and tgt and rel:
+        return {"source": src, "relation": "IsA", "target": tgt}
+    return None
 
 def _coerce_single_triple(text: str, keyword: str) -> Dict[str, str]:
     """
-    모델 출력에서 단일 triple(dict)을 최대한 안전하게 추출.
+    모델 출력(JSON 모드 → 순수 JSON 객체)에서 단일 triple(dict)을 추출.
     기대 스키마:
       {"source": "<keyword>", "relation": "IsA", "target": "<definition>"}
+    실패 시 키워드만 채운 기본형(target="") 반환.
     """
-    def _from_dict(d: dict) -> Dict[str, str] | None:
-        src = _norm(str(d.get("source", "")))
-        rel = _norm(str(d.get("relation", "")))
-        tgt = _norm(str(d.get("target", "")))
-        if src and tgt and rel:
-            return {"source": src, "relation": "IsA", "target": tgt}
-        return None
-
-    # 1) 바로 JSON 파싱
     try:
-        data = json.loads(text)
-        if isinstance(data, dict):
-            tri = _from_dict(data)
-            if tri: return tri
-        # 혹시 리스트로 왔다면 첫 원소만 사용
-        if isinstance(data, list) and data and isinstance(data[0], dict):
-            tri = _from_dict(data[0])
-            if tri: return tri
+        data = _loads(text)
     except Exception:
-        pass
-
-    # 2) ```json ... ``` 코드펜스 내부 파싱
-    m = re.search(r"```json\s*(\{.*?\}|\[.*?\])\s*```", text, flags=re.S)
-    if m:
-        try:
-            data = json.loads(m.group(1))
-            if isinstance(data, dict):
-                tri = _from_dict(data)
-                if tri: return tri
-            if isinstance(data, list) and data and isinstance(data[0], dict):
-                tri = _from_dict(data[0])
-                if tri: return tri
-        except Exception:
-            pass
-
-    # 3) 실패 시 키워드만 채워서 기본형 반환
-    return {"source": _norm(keyword), "relation": "IsA", "target": ""}
+        data = None
+    tri = _from_dict(data) if isinstance(data, dict) else None
+    return tri or {"source": _norm(keyword), "relation": "IsA", "target": ""}
 
 # ------------------------------
 # 프롬프트 (단일 정의 전용)
@@ -81,16 +119,106 @@ Input keyword: "Contract"
 Output: {"source": "Contract", "relation": "IsA", "target": "A legally binding agreement between parties enforceable by law."}
 '''
 
-USER_PROMPT_TEMPLATE = """\
-Keyword: "{keyword}"
+MAX_TOKENS = 80   # 단일 정의: JSON envelope + 25단어 문장이면 충분
+
+# ------------------------------
+# 프롬프트 (배치 정의: 번호 목록 → 순서대로 triple 배열)
+# ------------------------------
+BATCH_SIZE = 20                 # 한 번의 호출에 넣을 키워드 수 상한
+BATCH_TOKENS_PER_KEYWORD = 70   # 키워드당 triple 1개(25단어 정의) 분량
+BATCH_TOKENS_BASE = 20          # {"triples": [...]} envelope
+
+BATCH_SYSTEM_PROMPT = '''
+You are a precise definition generator.
+Given a numbered list of keywords, return ONE JSON object: {"triples": [...]}.
+"triples" must contain exactly one object per keyword, in the same order, each with keys: source, relation, target.
+
+Rules:
+- source: exactly the given keyword
+- relation: always "IsA"
+- target: one short, clear sentence (≤ 25 words)
+- Keep definitions concise and legally relevant when appropriate
+- Output must be pure JSON only. No extra text.
+
+Example:
+Keywords:
+1. "GDPR"
+2. "Contract"
+Output: {"triples": [{"source": "GDPR", "relation": "IsA", "target": "An EU regulation governing personal data protection and privacy."}, {"source": "Contract", "relation": "IsA", "target": "A legally binding agreement between parties enforceable by law."}]}
+'''
+
+# 캐시 키의 프롬프트 구성요소 (프롬프트가 바뀌면 이전 정의를 재사용하지 않음)
+_PROMPT_TAG = hashlib.sha256((SYSTEM_PROMPT + BATCH_SYSTEM_PROMPT).encode("utf-8")).hexdigest()[:12]
+
+def _parse_batch(text: str) -> List | None:
+    """배치 응답 → 원소 리스트. {"triples": [...]} 또는 [...] 허용, 파싱 실패 시 None."""
+    try:
+        data = _loads(text)
+    except Exception:
+        return None
+    if isinstance(data, dict):
+        data = data.get("triples")
+    return data if isinstance(data, list) else None
 
-Return JSON only:
-{{
-  "source": "{keyword}",
-  "relation": "IsA",
-  "target": "<one-sentence precise definition (<= 40 words)>"
-}}
-"""
+def _match_items(items: List, keywords: List[str]) -> List | None:
+    """
+    응답 원소를 각 원소의 source(정규화 소문자) 기준으로 keywords 순서에 맞춘다.
+    문자열 원소는 JSON 객체로 풀어 본다. source를 가진 원소가 하나도 없을 때만
+    위치 기준으로 대응시키고, 대응되는 원소가 없는 키워드가 있으면 None (잘못된 응답).
+    """
+    by_source: Dict[str, object] = {}
+    for item in items:
+        if isinstance(item, str):
+            try:
+                item = _loads(item)
+            except Exception:
+                continue
+        if isinstance(item, dict) and _norm(str(item.get("source") or "")):
+            by_source.setdefault(_norm_lower(str(item["source"])), item)
+    if not by_source:
+        return items[:len(keywords)] if len(items) >= len(keywords) else None
+    matched = [by_source.get(_norm_lower(kw)) for kw in keywords]
+    return None if any(m is None for m in matched) else matched
+
+def _define_batch(client: OpenAI, keywords: List[str], model: str) -> List[Tuple[Dict[str, str], bool]]:
+    """
+    keywords 한 묶음을 한 번의 호출로 정의. 응답 원소는 source 기준으로 키워드에 대응시키며,
+    응답이 잘렸거나(finish_reason=length) 대응되지 않는 키워드가 있으면 묶음을 반으로 나눠
+    재시도하고, 1개짜리는 단일 파싱으로 폴백.
+    키워드별 (triple, 응답 source가 키워드와 일치했는지) 반환 — 일치한 정의만 캐시한다.
+    """
+    user_prompt = "Keywords:\n" + "\n".join(f'{i}. "{kw}"' for i, kw in enumerate(keywords, 1))
+    resp = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        max_tokens=BATCH_TOKENS_BASE + BATCH_TOKENS_PER_KEYWORD * len(keywords),
+        response_format={"type": "json_object"},  # {"triples": [...]} 순수 JSON 보장
+    )
+    choice = resp.choices[0]
+    text = choice.message.content
+    items = _parse_batch(text)
+    truncated = getattr(choice, "finish_reason", None) == "length"
+    matched = _match_items(items, keywords) if items is not None and not truncated else None
+
+    if matched is None:
+        if len(keywords) > 1:
+            mid = len(keywords) // 2
+            return _define_batch(client, keywords[:mid], model) + _define_batch(client, keywords[mid:], model)
+        matched = [text]
+
+    out: List[Tuple[Dict[str, str], bool]] = []
+    for kw, item in zip(keywords, matched):
+        triple = _from_dict(item) if isinstance(item, dict) else None
+        if triple is None:
+            triple = _coerce_single_triple(item if isinstance(item, str) else "", kw)
+        verified = _norm_lower(triple["source"]) == _norm_lower(kw)
+        triple["relation"] = "IsA"
+        triple["source"] = kw
+        out.append((triple, verified))
+    return out
 
 # ------------------------------
 # 공개 함수
@@ -98,9 +226,17 @@ Return JSON only:
 def build_term_definition_triples(keyword: str, model: str = "gpt-4o-mini") -> List[Dict[str, str]]:
     """
     키워드 하나의 정의만 생성하여 [{source, relation, target}] (길이 1) 리스트로 반환.
+    캐시 hit 시 클라이언트 생성/API 호출 없이 반환.
     """
-    client = OpenAI()
-    user_prompt = USER_PROMPT_TEMPLATE.format(keyword=keyword)
+    key = _cache_key(keyword, model)
+    cached = _cache_get(key)
+    if cached:
+        return [{"source": keyword, "relation": "IsA", "target": cached}]
+
+    client = _get_client()
+    # 시스템 프롬프트(규칙+예시)는 매 호출 동일 바이트로 맨 앞에 보내고(프롬프트 캐시 prefix),
+    # 호출마다 달라지는 키워드는 짧은 user 메시지에만 담는다.
+    user_prompt = f'Keyword: "{keyword}"\nReturn JSON only.'
 
     resp = client.chat.completions.create(
         model=model,
@@ -108,7 +244,8 @@ def build_term_definition_triples(keyword: str, model: str = "gpt-4o-mini") -> L
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt},
         ],
-        max_tokens=400,
+        max_tokens=MAX_TOKENS,
+        response_format={"type": "json_object"},  # 단일 triple 객체 순수 JSON 보장
     )
 
     text = resp.choices[0].message.content
@@ -118,13 +255,42 @@ def build_term_definition_triples(keyword: str, model: str = "gpt-4o-mini") -> L
     triple["relation"] = "IsA"
     # source를 키워드로 강제(모델이 변형해도 일관성 유지)
     triple["source"] = keyword
+    _cache_put(key, triple["target"])
 
     # 기존 파이프라인 호환: 리스트로 감싸서 반환
     return [triple]
 
+def build_term_definition_triples_batch(keywords: List[str], model: str = "gpt-4o-mini") -> List[Dict[str, str]]:
+    """
+    여러 키워드의 정의를 BATCH_SIZE 단위 호출로 생성.
+    입력 순서대로 키워드당 triple 1개씩 [{source, relation, target}, ...] 반환
+    (정의 실패 시 target은 빈 문자열). 캐시 hit 키워드는 호출에서 제외.
+    """
+    keywords = list(keywords)
+    if not keywords:
+        return []
+    keys = [_cache_key(kw, model) for kw in keywords]
+    out: List[Optional[Dict[str, str]]] = []
+    missing: List[int] = []
+    for i, (kw, key) in enumerate(zip(keywords, keys)):
+        cached = _cache_get(key)
+        out.append({"source": kw, "relation": "IsA", "target": cached} if cached else None)
+        if not cached:
+            missing.append(i)
+
+    if missing:
+        client = _get_client()
+        for j in range(0, len(missing), BATCH_SIZE):
+            idxs = missing[j:j + BATCH_SIZE]
+            for i, (triple, verified) in zip(idxs, _define_batch(client, [keywords[i] for i in idxs], model)):
+                out[i] = triple
+                if verified:   # 다른 키워드의 정의일 수 있는 응답은 캐시에 남기지 않음
+                    _cache_put(keys[i], triple["target"])
+    return out
+
 # ------------------------------
 # 간단 실행 예시
 # ------------------------------
 if __name__ == "__main__":
     result = build_term_definition_triples("Elon Musk")
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(_dumps(result))